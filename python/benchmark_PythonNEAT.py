@@ -0,0 +1,256 @@
+'''
+Time the main operations of PythonNEAT over a grid of network and population sizes, write the results to a JSON file,
+and compare them against a stored baseline.
+
+The networks are made by a seeded synthetic generator, so every run times the same work. Each operation is timed
+several times and the fastest time is kept, since the slower ones only measure interference from the rest of the
+machine. Only NumPy (and PythonNEAT itself) is needed.
+
+Results are written to benchmark_results/benchmark_PythonNEAT.json next to this script unless --output is given (the
+directory is ignored by git). Timings only compare on the same machine, so no baseline is kept in the repository:
+record one by running the benchmark on the commit to compare against, with the same options as the later runs.
+
+Examples:
+    python benchmark_PythonNEAT.py --output benchmark_results/baseline.json
+    python benchmark_PythonNEAT.py --baseline benchmark_results/baseline.json --tolerance 0.25
+    python benchmark_PythonNEAT.py --quick --output benchmark_results/quick_baseline.json
+    python benchmark_PythonNEAT.py --quick --baseline benchmark_results/quick_baseline.json
+
+The exit status is 1 if any operation is slower than its baseline by more than the tolerance, and 0 otherwise.
+Whether float32 evaluation stays close to float64 is checked separately by check_float32_PythonNEAT.py.
+'''
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+
+import numpy as np
+
+# PythonNEAT has no .py extension, so load it from the file next to this script
+loader = SourceFileLoader('PythonNEAT', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'PythonNEAT'))
+PythonNEAT = module_from_spec(spec_from_loader('PythonNEAT', loader))
+loader.exec_module(PythonNEAT)
+
+# The directory the results are written to by default
+results_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+
+# The sizes benchmarked by default, and with --quick
+network_sizes = [5, 50, 500, 2000]
+population_sizes = [10, 100, 1000, 10000]
+quick_network_sizes = [5, 50, 500]
+quick_population_sizes = [10, 100]
+
+def synthetic_network(n_input, n_output, n_total, random_generator, storage_type = 0, dtype = np.float64):
+    '''
+    Creates a random network with n_total nodes, in which every non-input node has a few incoming edges from random
+    nodes (so larger networks have cycles) and every input node feeds a random output node.
+        Inputs:
+            n_input: number of input nodes
+            n_output: number of output nodes
+            n_total: total number of nodes, including the bias node
+            random_generator: a numpy Generator for the weights and edges
+            storage_type: store the weights as dense arrays if 0, as a sparse edge list if 1 (default value of 0)
+            dtype: the float type of the network, np.float32 or np.float64 (default value of np.float64)
+        Outputs:
+            network: the random network
+    '''
+
+    weight_array = np.zeros((n_total, n_total))
+    for j in range(n_input + 1, n_total):
+        sources = random_generator.choice(n_total, size = min(4, n_total), replace = False)
+        weight_array[sources, j] = 2*random_generator.random(len(sources)) - 1
+    outputs = random_generator.integers(n_input + 1, n_input + n_output + 1, size = n_input + 1)
+    weight_array[np.arange(n_input + 1), outputs] = 2*random_generator.random(n_input + 1) - 1
+    network = PythonNEAT.Network(n_input, n_output, weight_array = weight_array, storage_type = storage_type, \
+                                 random_generator = random_generator, dtype = dtype)
+    return network
+
+def measure(operation, setup = None, repeats = 5, min_time = 0.05, max_samples = 1000):
+    '''
+    Times an operation, calling it at least repeats times and until min_time seconds have been spent on it.
+    The time of setup is not counted.
+        Inputs:
+            operation: a function to time, called with the output of setup (or with nothing if there is no setup)
+            setup: a function preparing the argument of operation for each call, or None (default value of None)
+            repeats: minimum number of calls (default value of 5)
+            min_time: minimum total time to spend in operation (default value of 0.05)
+            max_samples: maximum number of calls (default value of 1000)
+        Outputs:
+            result: a dictionary with the fastest and the median time of one call in seconds, and the number of calls
+    '''
+
+    samples = []
+    while (len(samples) < repeats) or ((sum(samples) < min_time) and (len(samples) < max_samples)):
+        if setup is None:
+            start_time = time.perf_counter()
+            operation()
+        else:
+            argument = setup()
+            start_time = time.perf_counter()
+            operation(argument)
+        samples.append(time.perf_counter() - start_time)
+    result = {'seconds': min(samples), 'median_seconds': float(np.median(samples)), 'samples': len(samples)}
+    return result
+
+def benchmark_networks(sizes, repeats, seed, dtype):
+    '''
+    Times Network.evaluate, mutate, add_node, __add__ and label_nodes for networks of each size. The operations
+    that change a network are timed on a clone with a newly seeded generator, so every call starts from the same
+    network and makes the same random changes.
+        Inputs:
+            sizes: a list of the numbers of nodes of the networks
+            repeats: minimum number of calls of each operation
+            seed: seed of the synthetic networks
+            dtype: the float type of the networks
+        Outputs:
+            results: a dictionary of the result of measure for each operation and size
+    '''
+
+    results = {}
+    for n_total in sizes:
+        random_generator = np.random.default_rng([seed, n_total])
+        n_input = min(3, n_total - 2)
+        network = synthetic_network(n_input, 1, n_total, random_generator, dtype = dtype)
+        other_network = synthetic_network(n_input, 1, n_total, random_generator, dtype = dtype)
+        input_array = 2*random_generator.random(n_input) - 1
+        network.species
+        other_network.species
+        name = '[n_total=%d]' % n_total
+
+        def clone_network():
+            return network.clone(np.random.default_rng([seed, n_total]))
+
+        results['Network.evaluate' + name] = measure(lambda: network.evaluate(input_array), repeats = repeats)
+        results['Network.mutate' + name] = measure(lambda clone: clone.mutate(), setup = clone_network, repeats = repeats)
+        results['Network.add_node' + name] = measure(lambda clone: clone.add_node(), setup = clone_network, repeats = repeats)
+        results['Network.__add__' + name] = measure(lambda: network + other_network, repeats = repeats)
+        results['Network.label_nodes' + name] = measure(lambda: network.label_nodes(), repeats = repeats)
+        print('    networks of %d nodes done' % n_total, file = sys.stderr)
+    return results
+
+def benchmark_populations(sizes, repeats, seed, dtype):
+    '''
+    Times Population.evaluate_all and next_generation for populations of each size, evolved for a few
+    generations first so that the networks are not all the initial one. next_generation is timed on a new
+    copy of the population for each call.
+        Inputs:
+            sizes: a list of the numbers of networks in the populations
+            repeats: minimum number of calls of each operation
+            seed: seed of the populations
+            dtype: the float type of the networks
+        Outputs:
+            results: a dictionary of the result of measure for each operation and size
+    '''
+
+    results = {}
+    for pop_size in sizes:
+        random_generator = np.random.default_rng([seed, pop_size])
+        population = PythonNEAT.Population(3, 1, pop_size, max_pop_size = pop_size, seed = seed, dtype = dtype)
+        for generation in range(3):
+            population.next_generation(random_generator.random(population.population_size()))
+        input_array = 2*random_generator.random(3) - 1
+        fitness_array = random_generator.random(population.population_size())
+        name = '[pop_size=%d]' % pop_size
+
+        def copy_population():
+            population.save_checkpoint(checkpoint_name)
+            return PythonNEAT.Population.load_checkpoint(checkpoint_name)
+
+        with tempfile.TemporaryDirectory() as checkpoint_directory:
+            checkpoint_name = os.path.join(checkpoint_directory, 'population.npz')
+            results['Population.evaluate_all' + name] = measure(lambda: population.evaluate_all(input_array), repeats = repeats)
+            results['Population.next_generation' + name] = measure(lambda copy: copy.next_generation(fitness_array.copy()), \
+                                                                   setup = copy_population, repeats = repeats, min_time = 0)
+        print('    populations of %d networks done' % pop_size, file = sys.stderr)
+    return results
+
+def compare_results(results, baseline, tolerance):
+    '''
+    Compares the fastest times against a baseline and prints a table of the ratios.
+        Inputs:
+            results: the results of this run
+            baseline: the results of an earlier run
+            tolerance: allowed relative slowdown, so 0.25 allows 25% slower than the baseline
+        Outputs:
+            regressions: a list of the names of the operations slower than the tolerance allows
+    '''
+
+    regressions = []
+    print('%-45s %12s %12s %8s' % ('operation', 'baseline', 'current', 'ratio'))
+    for name in sorted(results):
+        if name not in baseline:
+            print('%-45s %12s %12.3e %8s' % (name, '-', results[name]['seconds'], 'new'))
+            continue
+        ratio = results[name]['seconds']/baseline[name]['seconds']
+        flag = ''
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('%-45s %12.3e %12.3e %8.2f%s' % (name, baseline[name]['seconds'], results[name]['seconds'], ratio, flag))
+    return regressions
+
+def main(arguments = None):
+    '''
+    Runs the benchmarks from the command line.
+        Inputs:
+            arguments: a list of command line arguments, or None to use sys.argv (default value of None)
+        Outputs:
+            exit_status: 1 if there was a regression against the baseline, 0 otherwise
+    '''
+
+    parser = argparse.ArgumentParser(description = 'Benchmark PythonNEAT.')
+    parser.add_argument('--output', default = os.path.join(results_directory, 'benchmark_PythonNEAT.json'), \
+                        help = 'JSON file to write the results to (default benchmark_results/benchmark_PythonNEAT.json next to this script)')
+    parser.add_argument('--baseline', default = None, help = 'JSON file of an earlier run to compare against')
+    parser.add_argument('--tolerance', type = float, default = 0.25, help = 'allowed relative slowdown against the baseline')
+    parser.add_argument('--repeats', type = int, default = 5, help = 'minimum number of calls of each operation')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed of the synthetic networks and populations')
+    parser.add_argument('--network-sizes', type = int, nargs = '+', default = None, help = 'numbers of nodes of the networks')
+    parser.add_argument('--population-sizes', type = int, nargs = '+', default = None, help = 'numbers of networks in the populations')
+    parser.add_argument('--dtype', choices = ['float64', 'float32'], default = 'float64', help = 'float type of the benchmarked networks')
+    parser.add_argument('--quick', action = 'store_true', help = 'use a smaller grid of sizes')
+    options = parser.parse_args(arguments)
+    if (options.baseline is not None) and (not os.path.isfile(options.baseline)):
+        parser.error('the baseline %s does not exist, record one first with --output %s' % (options.baseline, options.baseline))
+
+    # Choose the grid of sizes
+    if options.network_sizes is None:
+        options.network_sizes = quick_network_sizes if options.quick else network_sizes
+    if options.population_sizes is None:
+        options.population_sizes = quick_population_sizes if options.quick else population_sizes
+
+    # Run the benchmarks
+    dtype = np.dtype(options.dtype).type
+    results = {}
+    results.update(benchmark_networks(options.network_sizes, options.repeats, options.seed, dtype))
+    results.update(benchmark_populations(options.population_sizes, options.repeats, options.seed, dtype))
+
+    # Write the results
+    report = {'metadata': {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(), \
+                           'seed': options.seed, 'repeats': options.repeats, 'network_sizes': options.network_sizes, \
+                           'population_sizes': options.population_sizes, 'dtype': options.dtype}, 'results': results}
+    os.makedirs(os.path.dirname(os.path.abspath(options.output)), exist_ok = True)
+    with open(options.output, 'w') as fileID:
+        json.dump(report, fileID, indent = 2, sort_keys = True)
+
+    # Compare against the baseline
+    if options.baseline is None:
+        for name in sorted(results):
+            print('%-45s %12.3e' % (name, results[name]['seconds']))
+        return 0
+    with open(options.baseline) as fileID:
+        baseline = json.load(fileID)['results']
+    regressions = compare_results(results, baseline, options.tolerance)
+    if len(regressions) > 0:
+        print('%d operation(s) slower than the baseline by more than %g%%.' % (len(regressions), 100*options.tolerance))
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
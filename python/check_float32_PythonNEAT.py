@@ -0,0 +1,88 @@
+'''
+Check that float32 networks of PythonNEAT evaluate within a documented tolerance of float64 ones.
+
+A float32 and a float64 population are evolved from the same seed, which gives the same networks up to rounding, and
+the species and the activated outputs (np.tanh(activation_scale*output)) of every network are compared, for dense and
+sparse storage. The outputs themselves are not compared, since float32 saturates sooner and caps them. Only NumPy (and
+PythonNEAT itself) is needed.
+
+Examples:
+    python check_float32_PythonNEAT.py
+    python check_float32_PythonNEAT.py --seed 3 --generations 20
+
+The exit status is 1 if the species differ or the activated outputs differ by more than dtype_tolerance, and 0 otherwise.
+'''
+
+import argparse
+import os
+import sys
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+
+import numpy as np
+
+# PythonNEAT has no .py extension, so load it from the file next to this script
+loader = SourceFileLoader('PythonNEAT', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'PythonNEAT'))
+PythonNEAT = module_from_spec(spec_from_loader('PythonNEAT', loader))
+loader.exec_module(PythonNEAT)
+
+# The largest difference allowed between the activated outputs of float32 and float64 networks
+dtype_tolerance = 1e-4
+
+def check_dtype(seed, generations = 10):
+    '''
+    Evolves a float32 and a float64 population from the same seed and compares their species and the activated
+    outputs of every network, for dense and sparse storage.
+        Inputs:
+            seed: seed of the populations and inputs
+            generations: number of generations to evolve (default value of 10)
+        Outputs:
+            result: a dictionary with the largest difference of the activated outputs, the tolerance, and whether the check passed
+    '''
+
+    max_error = 0.0
+    species_match = 1
+    for storage_type in (0, 1):
+        populations = []
+        for dtype in (np.float64, np.float32):
+            random_generator = np.random.default_rng(seed)
+            population = PythonNEAT.Population(3, 2, 50, max_pop_size = 100, seed = seed, storage_type = storage_type, dtype = dtype)
+            for generation in range(generations):
+                population.next_generation(random_generator.random(population.population_size()))
+            populations.append(population)
+        input_array = 2*np.random.default_rng(seed).random((8, 3)) - 1
+        for network64, network32 in zip(populations[0].network_population, populations[1].network_population):
+            if network64.species != network32.species:
+                species_match = 0
+            output64 = np.tanh(network64.activation_scale*network64.evaluate_batch(input_array))
+            output32 = np.tanh(network32.activation_scale*network32.evaluate_batch(input_array).astype(np.float64))
+            max_error = max(max_error, float(np.amax(np.abs(output64 - output32))))
+    result = {'max_error': max_error, 'tolerance': dtype_tolerance, 'species_match': species_match, \
+              'passed': int((species_match == 1) and (max_error <= dtype_tolerance))}
+    return result
+
+def main(arguments = None):
+    '''
+    Runs the check from the command line.
+        Inputs:
+            arguments: a list of command line arguments, or None to use sys.argv (default value of None)
+        Outputs:
+            exit_status: 1 if float32 is outside the tolerance, 0 otherwise
+    '''
+
+    parser = argparse.ArgumentParser(description = 'Check float32 evaluation of PythonNEAT against float64.')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed of the populations and inputs')
+    parser.add_argument('--generations', type = int, default = 10, help = 'number of generations to evolve')
+    options = parser.parse_args(arguments)
+
+    # Run the check and report it
+    result = check_dtype(options.seed, generations = options.generations)
+    print('float32 against float64: largest difference of activated outputs %.2e (tolerance %.0e), species %s' % \
+          (result['max_error'], dtype_tolerance, 'match' if result['species_match'] == 1 else 'DIFFER'))
+    if result['passed'] == 0:
+        print('float32 evaluation is outside the tolerance.')
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())